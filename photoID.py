@@ -13,22 +13,33 @@ Question
 Functions
 ---------
 explore_folder
+check_file
+compile_terms
+fit_image
+accumulate
+row_normalize
 tkclear
 load_results
 photo_quizz
-param_window
+main
 """
 
 import os
+import re
+import csv
 import random
+import functools
+from concurrent.futures import ThreadPoolExecutor
 
 import tkinter as tk
 import pandas as pd
 import numpy as np
+# matplotlib, tkfilebrowser, PIL and the optional numba are imported where
+# they are used, to keep the module quick to import.
 
-import matplotlib.pyplot as plt
-import tkfilebrowser as tkf
-from PIL import Image, ImageOps, ImageTk
+# Number of array elements from which numba compiled loops are used, when
+# numba is installed. Smaller arrays are faster with numpy than compiling.
+NUMBA_MIN_SIZE = 1_000_000
 
 
 class Quizz:
@@ -42,16 +53,24 @@ class Quizz:
     - top_frame (tk.Frame): Top frame of quizz window.
     - mid_frame (tk.Frame): Mid frame of quizz window.
     - bot_frame (tk.Frame): Bottom frame of quizz window.
+    - im_size (int): Size of the square photos displayed in the window.
+    - photo_cache (function): load_photo with a cache of the last photos.
         Quizz information
     - folders (list of path like): folders containing the photographs.
     - excl (list of str): list of exclusion terms for photo selection.
     - incl (list of str): list of inclusion terms for photo selection.
     - resources (dict): list of available pictures per individual
     - id_list (list of str): list of individuals in the pictures
+    - id_to_idx (dict): row (and column) of each individual in score_arr.
+    - name_to_idx (dict): id_to_idx with case folded names, to check answers.
     - n (int): Number of questions in the quizz.
         Quizz progress
-    - score (pd.DataFrame): table storing the quizz results.
+    - score (pd.DataFrame): table storing the quizz results. Built from
+        score_arr on each access, so it is always up to date.
+    - score_arr (np.ndarray): answer counts during the quizz, as in score.
     - q_no (int): Index of question number.
+    - schedule (list of (str, path like)): individual and photo of each
+        question of the quizz.
     - res (matplotlib.Figure, matplotlib.Axes): Figure showing  quizz results.
         Save parameters
     - fig (path like): Location to save the figure of the quizz results.
@@ -62,7 +81,9 @@ class Quizz:
     __init__: Creates instance
     choose_photos: Finds and sorts photos within the provided folders
     build_score: Creates or checks the data frame for score tracking
+    record_answers: Adds a batch of answers to the score
     start_quizz: launches quizz
+    load_photo: Prepares a photo for display in the quizz window
     next_question: ends question and assess whether to display another one or
         to end the quizz
     end_quizz: ends the quizz
@@ -101,12 +122,34 @@ class Quizz:
         self.incl = incl
         self.excl = excl
         self.n = None
+        self.score_arr = None  # Answer counts, built with the score table.
         self.score = score
         self.fig = fig  # Store location to save figure.
         self.tab = tab  # Store location to save table.
         self.res = None  # Required if save_results called before show_results.
     
     
+    @property
+    def score(self):
+        """
+        Score table with individual names as index. Built from score_arr once
+        photos are chosen. A table assigned to score (e.g. previous scores
+        loaded with load_results) is returned as is until the next
+        build_score, which replaces the current answer counts with it.
+        """
+        
+        if self._score_table is not None or self.score_arr is None:
+            return self._score_table
+        ids = list(self.id_to_idx)
+        return pd.DataFrame(data=self.score_arr, index=ids,
+                            columns=ids + ['Correct'])
+    
+    
+    @score.setter
+    def score(self, score):
+        self._score_table = score
+    
+    
     def choose_photos(self, ff='.JPG', incl=None, excl=None):
         """
         Explore the photo folders provided by the users and gets a list of
@@ -130,21 +173,19 @@ class Quizz:
         if excl is not None:
             self.excl = excl
         
-        pic_list = []
-        id_list = []
-        for i in self.folders:
-            inds, photos = explore_folder(i, ff=ff,
-                                          incl=self.incl, excl=self.excl
-                                          )
-            pic_list += photos
-            id_list += inds
-        
-        # Get list of individuals ids in alphabetical order.
-        self.id_list = sorted(list(set(id_list)))
         # Stores photos by individuals in a dictionnary.
+        # Folders are explored in parallel as it mostly waits for the disk.
+        explore = functools.partial(explore_folder, ff=ff,
+                                    incl=self.incl, excl=self.excl)
         self.resources = {}
-        for i in self.id_list:
-            self.resources[i] = [pic for pic in pic_list if i in pic]
+        with ThreadPoolExecutor(max_workers=max(1, min(8, len(self.folders)))
+                                ) as ex:
+            for pairs in ex.map(explore, self.folders):
+                for ind, pic in pairs:
+                    self.resources.setdefault(ind, []).append(pic)
+        
+        # Get list of individuals ids in alphabetical order.
+        self.id_list = sorted(self.resources)
         
         # Build or update score table based on photo selection.
         self.build_score()
@@ -154,35 +195,69 @@ class Quizz:
         """
         Build pd.Dataframe with individual names as index to score
         identification results. Checks if names in self.id_list are already in
-        dataframe if previous scores have been loaded.        
-        """
-        
-        if not self.score:  # Build score dataframe from scratch.
-            self.score = pd.DataFrame(data=np.zeros(shape=(len(self.id_list),
-                                                           len(self.id_list) + 1
-                                                           )
-                                                    ),
-                                      index=self.id_list,
-                                      columns=self.id_list + ['Correct'],
-                                      dtype=float
-                                      )
-        else:  # Check for the presence of each individual in previous score.
-            for i in self.id_list:
-                if i not in self.score.index:
-                    # Add row with id i at bottom.
-                    row = pd.Series(data=np.zeros(shape=(self.score.shape[1])),
-                                    index=self.score.columns, dtype=float)
-                    self.score.loc[i] = row
-                    # Add column with individual name.
-                    col = pd.Series(data=np.zeros(self.score.shape[0]),
-                                    index=self.score.index, dtype=float)
-                    self.score.loc[:, i] = col
-            # Reorder lines
-            self.score=self.score.sort_index()
-            # Reorder columns to keep 'Correct at the end'
-            cols = self.score.columns
-            new_cols = sorted([c for c in cols if c != 'Correct']) + ['Correct']
-            self.score = self.score[new_cols]
+        dataframe if previous scores have been loaded.
+        Answers are counted in a numpy array during the quizz, from which the
+        score table is built.
+        """
+        
+        # Previous rows, columns and answer counts. A score table assigned
+        # since the last build replaces the answers of previous quizz.
+        if self._score_table is not None:  # Previous score table loaded.
+            table = self._score_table
+            # Labels as text, to compare and sort them with the photo names.
+            prior = ([str(i) for i in table.index],
+                     [str(i) for i in table.columns], table.to_numpy())
+            self._score_table = None  # Now stored in score_arr.
+        elif self.score_arr is not None:  # Keep answers of previous quizz.
+            rows = list(self.id_to_idx)
+            prior = (rows, rows + ['Correct'], self.score_arr)
+        else:
+            prior = None
+        
+        if prior is None:  # id_list is already sorted and without duplicates.
+            ids = self.id_list
+        else:  # Keep individuals of previous score.
+            ids = set(self.id_list).union(prior[0], prior[1])
+            ids.discard('Correct')
+            ids = sorted(ids)
+        
+        # Row (and column) of each individual in the score array, which is
+        # square with 'Correct' as last column.
+        self.id_to_idx = {i: k for k, i in enumerate(ids)}
+        self.name_to_idx = {i.casefold(): k for i, k in self.id_to_idx.items()}
+        self.score_arr = np.zeros(shape=(len(ids), len(ids) + 1),
+                                  dtype=np.int64)
+        if prior is not None:  # Copy previous score in a single block.
+            rows, cols, values = prior
+            col_idx = dict(self.id_to_idx, Correct=len(ids))
+            r = [self.id_to_idx[i] for i in rows]
+            c = [col_idx[i] for i in cols]
+            self.score_arr[np.ix_(r, c)] = values
+    
+    
+    def record_answers(self, answers):
+        """
+        Adds a batch of answers to the score, e.g. to replay answers logged
+        during previous quizzes.
+        
+        Argument
+        --------
+        answers (list of (str, str)): true identity and given answer of each
+            question. Given answers are compared regardless of case. Answers
+            which true identity or given answer is not in the score table
+            are ignored.
+        """
+        
+        names = [(ind, given.strip().casefold()) for ind, given in answers]
+        # Right answers are checked against the true id itself, as ids
+        # differing only by case share a name.
+        pairs = [(self.id_to_idx[ind],
+                  self.id_to_idx[ind] if given == ind.casefold()
+                  else self.name_to_idx[given])
+                 for ind, given in names
+                 if ind in self.id_to_idx and given in self.name_to_idx]
+        pairs = np.array(pairs, dtype=np.int64).reshape(-1, 2)
+        accumulate(pairs, self.score_arr, self.score_arr.shape[1] - 1)
     
     
     def start_quizz(self, n=None):
@@ -212,15 +287,51 @@ class Quizz:
         self.bot_frame = tk.Frame(self.window)
         self.bot_frame.pack()
         
+        # Size of the square photos, fitted to the window size set above.
+        self.im_size = round(2/3 * min(w-10, h-10))
+        # Tkinter images belong to the window, so the cache does too. It only
+        # keeps the displayed and prefetched photos, plus a few recent ones:
+        # each image holds a bitmap of the display size in memory.
+        self.photo_cache = functools.lru_cache(maxsize=4)(self.load_photo)
+        
         if n is not None:
             self.n = n
             self.q_no = 0
+            # Draw the individual and photo of each question in advance.
+            # Each round asks all individuals in random order, and photos of
+            # an individual are not repeated before all of them were shown.
+            photos = {i: [] for i in self.id_list}
+            self.schedule = []
+            while self.id_list and len(self.schedule) < self.n:
+                for ind in random.sample(self.id_list, k=len(self.id_list)):
+                    if not photos[ind]:
+                        photos[ind] = random.sample(self.resources[ind],
+                                                    k=len(self.resources[ind]))
+                    self.schedule.append((ind, photos[ind].pop()))
+            del self.schedule[self.n:]
             # Make a start button.
             start_button = tk.Button(self.mid_frame, text="Start",
                                      command = self.next_question)
             start_button.pack(padx='3m', pady='1m', expand=True)
     
     
+    def load_photo(self, photo):
+        """
+        Makes a photo square and fits it to the window size, in tkinter
+        compatible format. Called through photo_cache, which keeps a reference
+        to the image as tkinter does not.
+        
+        Argument
+        --------
+        photo (path like): path to the photo.
+        """
+        
+        from PIL import ImageTk
+        
+        im_fit = fit_image(photo, self.im_size)
+        return ImageTk.PhotoImage(im_fit, master=self.window)
+    
+    
     def next_question(self):
         """
         Empties the frames of the window, then starts the next question.
@@ -234,7 +345,11 @@ class Quizz:
         tkclear(self.bot_frame)
         
         if self.q_no <= self.n:
-            Question(self)
+            ind, photo = self.schedule[self.q_no - 1]
+            Question(self, ind=ind, photo=photo)
+            if self.q_no < self.n:  # Prepare next photo while user answers.
+                next_photo = self.schedule[self.q_no][1]
+                self.window.after_idle(self.photo_cache, next_photo)
         else:
             self.end_quizz()
     
@@ -244,9 +359,9 @@ class Quizz:
         After the last question of the quizz, displays an ending message
         and closes the window.
         """
-        n_correct = sum(self.score.loc[:, 'Correct'])
-        n_total = np.sum(self.score.values) - n_correct
-        success = round(n_correct / n_total * 100)
+        n_correct = int(self.score_arr[:, -1].sum())
+        n_total = int(self.score_arr[:, :-1].sum())
+        success = round(100 * n_correct / max(n_total, 1))
         
         # End message.
         msg = 'Test finished !\nYour overall success rate is {}%'.format(success)
@@ -266,51 +381,61 @@ class Quizz:
         button.pack(side=tk.LEFT)
     
     
-    def show_results(self, cmap=plt.cm.Blues, show=True):
+    def show_results(self, cmap='Blues', show=True):
         """
         Displays the current score matrix with a color code.
         Arguments
         ---------
-        cmap (color map): color map to use. Default is Blues. See matplotlib
-            for details.
+        cmap (color map or str): color map to use. Default is Blues. See
+            matplotlib for details.
         show (bool): whether to show the plot or not. Default is True and
-            shows the plot.
+            shows the plot. Otherwise the figure is only drawn with Agg, for
+            saving.
         """
         
-        # Keep only individuals with a quizz record.
-        idx_row = [i for i in self.score.index if sum(self.score.loc[i] > 0)]
-        idx_col = [i for i in self.score.columns
-                   if (i in idx_row or sum(self.score.loc[:, i]) > 0)
-                   ]
-        if 'Correct' not in idx_col:
-            idx_col.append('Correct')
-        score_data = self.score.loc[idx_row, idx_col]
+        # Keep only individuals with a quizz record, and 'Correct' column.
+        answered = self.score_arr != 0
+        keep_row = answered.any(axis=1)
+        keep_col = np.append(answered[:, :-1].any(axis=0) | keep_row, True)
+        counts = self.score_arr[np.ix_(keep_row, keep_col)]
+        ids = np.array(list(self.id_to_idx), dtype=object)
+        row_labels = ids[keep_row]
+        col_labels = list(ids[keep_col[:-1]]) + ['Correct']
         
         # Transform values in proportion of id per individual for coloring.
-        score_colors = score_data.copy()
-        for ind in score_colors.index:
-            score_colors.loc[ind] /= sum(score_colors.loc[ind].iloc[:-1])
-            # Remove last column which scores correct answers.
+        # Last column which scores correct answers is excluded from the total.
+        colors = counts.astype(float)
+        row_normalize(colors, colors)
         
-        # Build figure and show id matrix.
-        fig = plt.figure(figsize=score_colors.shape)
+        # Build figure and show id matrix. Figures which are not shown do not
+        # go through pyplot and the GUI backend.
+        if show:
+            import matplotlib.pyplot as plt
+            fig = plt.figure(figsize=colors.shape)
+        else:
+            from matplotlib.figure import Figure
+            from matplotlib.backends.backend_agg import FigureCanvasAgg
+            fig = Figure(figsize=colors.shape)
+            FigureCanvasAgg(fig)
         ax = fig.add_subplot()
-        ax.imshow(score_colors, cmap=cmap, interpolation='nearest')
-        
-        # Add number of answers in each square.
-        rows, cols = score_data.shape
-        for r in range(rows):
-            for c in range(cols-1):
-                txt = str(int(score_data.iloc[r, c]))
-                ax.text(x=c, y=r, s=txt, va='center', ha='center')
-            txt = str(int(100*round(score_colors.iloc[r, cols-1], 2))) + '%'
-            ax.text(x=cols-1, y=r, s=txt, va='center', ha='center')
+        ax.imshow(colors, cmap=cmap, interpolation='nearest')
+        
+        # Add number of answers in each non empty square, and success rate of
+        # each individual in last column. All labels are formatted at once.
+        rows, cols = counts.shape
+        labels = counts.astype(str)
+        success = np.round(100 * colors[:, -1]).astype(int).astype(str)
+        labels[:, -1] = np.char.add(success, '%')
+        annotated = counts != 0
+        annotated[:, -1] = True
+        for r, c in zip(*np.nonzero(annotated)):
+            ax.text(x=c, y=r, s=labels[r, c], va='center', ha='center')
         
         # Display ids as axis tick labels.
         ax.set_yticks(range(rows))        
-        ax.set_yticklabels(score_data.index)
+        ax.set_yticklabels(row_labels)
         ax.set_xticks(range(cols))     
-        ax.set_xticklabels(score_data.columns, rotation=90)
+        ax.set_xticklabels(col_labels, rotation=90)
         
         # Place axis labels.
         ax.set_ylabel('True identity')
@@ -319,8 +444,6 @@ class Quizz:
         self.res = (fig, ax)
         if show:
             plt.show()
-        else:
-            plt.close()
     
     
     def save_results(self, figname=None, csvname=None):
@@ -332,7 +455,9 @@ class Quizz:
         figname (path like): Name of the image to save the results plot.
             Overrides the initialisation parameter.
         csvname (path like): Name to save the score table.
-            Overrides the initialisations parameter.
+            Overrides the initialisations parameter. Names ending in .parquet
+            or .feather save the table in these binary formats (requires
+            pyarrow), other names save a csv file.
         """
         
         # Updates output locations
@@ -349,7 +474,18 @@ class Quizz:
             self.res[0].savefig(self.fig, bbox_inches='tight')
         
         if self.tab:
-            self.score.to_csv(self.tab)
+            ext = os.path.splitext(self.tab)[1].lower()
+            if ext == '.parquet':
+                self.score.to_parquet(self.tab)
+            elif ext == '.feather':  # Feather does not store the index.
+                self.score.reset_index().to_feather(self.tab)
+            else:  # Write counts row by row, in the layout of DataFrame.to_csv.
+                ids = list(self.id_to_idx)
+                with open(self.tab, 'w', newline='') as f:
+                    writer = csv.writer(f)
+                    writer.writerow([''] + ids + ['Correct'])
+                    for name, row in zip(ids, self.score_arr.tolist()):
+                        writer.writerow([name] + row)
     
     
     def select_folder(self):
@@ -357,6 +493,8 @@ class Quizz:
         Button command to open file explorer and select a photo folder.
         """
         
+        import tkfilebrowser as tkf
+        
         f = tkf.askopendirname()
         self.folders.append(f)
     
@@ -364,11 +502,14 @@ class Quizz:
     def select_score(self):
         """
         Button command to open the csv file containing the previous scores to 
-        load. Previous scores must be dataframes in csv format.
+        load. Previous scores must be dataframes in csv, parquet or feather
+        format.
         """
         
+        import tkfilebrowser as tkf
+        
         score = tkf.askopenfilename()
-        self.scores = pd.read_csv(score)
+        self.score = load_results(score)
     
     
     def config(self):
@@ -492,7 +633,7 @@ class Question:
     ind (str): Ground truth name of individual displayed
     photo (path like): path to the displayed photo
     answer (tk.StringVar): answer provided by user
-    notif (tk.Tk): Feedback window once answer is verified
+    notif (tk.Toplevel): Feedback window once answer is verified
     
     Methods
     -------
@@ -523,17 +664,9 @@ class Question:
         # Display photo in quizz window mid frame.
         img_label = tk.Label(self.quizz.mid_frame)
         img_label.pack(side=tk.LEFT)
-        im = Image.open(self.photo)
-        # Make photo square and fit to window size.
-        size_str = self.quizz.window.geometry().split('+')[0].split('x')
-        winsize = [int(i) for i in size_str]
-        im_size = round(2/3 * min(winsize))
-        im_pad = ImageOps.pad(im, size=(max(im.size), max(im.size)),
-                              color=(100, 100, 100))
-        im_fit = ImageOps.fit(im_pad, size=(im_size, im_size))
-        # Transfer photo into tkinter compatible format.
-        im_tk = ImageTk.PhotoImage(im_fit)
-        img_label.image = im_tk
+        # Make photo square, fit to window size and transfer into tkinter
+        # compatible format.
+        img_label.image = self.quizz.photo_cache(self.photo)
         img_label['image'] = img_label.image
         # Put input box and buttons in bottom frame.
         self.answer = tk.StringVar()
@@ -556,25 +689,34 @@ class Question:
         """
         
         guess = self.answer.get()
-        if guess.lower() == self.ind.lower():  # Right answer.
+        score_arr = self.quizz.score_arr
+        i = self.quizz.id_to_idx[self.ind]
+        given = guess.strip().casefold()
+        # Ids differing only by case share a name, which places wrong answers
+        # only: right answers are checked against the true id itself.
+        j = self.quizz.name_to_idx.get(given)
+        if given == self.ind.casefold():  # Right answer.
             txt = "Well done!"
             # Updates score.
-            self.quizz.score.loc[self.ind, self.ind] += 1
-            self.quizz.score.loc[self.ind, 'Correct'] += 1
+            score_arr[i, i] += 1
+            score_arr[i, -1] += 1
         else:
             txt = "Wrong! Answer was {}, not {}".format(self.ind, guess)
-            try:
-                self.quizz.score.loc[self.ind, guess] += 1
-            except KeyError:  # Guess not in id_list or typo.
+            if j is not None:
+                score_arr[i, j] += 1
+            else:  # Guess not in id_list or typo.
                 txt += '\n{} is not even in the list...'.format(guess)
         
-        # Give feedback in new window.
-        self.notif = tk.Tk()
+        # Give feedback in new window on top of the quizz window.
+        self.notif = tk.Toplevel(self.quizz.window)
+        self.notif.transient(self.quizz.window)
         message = tk.Label(self.notif, text=txt)
         message.pack(padx='3m', pady='3m')
         button = tk.Button(self.notif, text="Continue", command=self.clicked)
         button.pack()
-        self.notif.mainloop()
+        # Answer cannot be checked twice. Grab needs the window to be mapped.
+        self.notif.wait_visibility()
+        self.notif.grab_set()
         
         
     def clicked(self):
@@ -598,7 +740,8 @@ def explore_folder(folder, ff='.JPG', incl=None, excl=None):
     Arguments
     ---------
     - folder (path like): the folder to explore
-    - ff (str): the format of the pictures to look for. Default is '.JPG'
+    - ff (str): the format of the pictures to look for, in lower or upper
+        case, with or without leading dot. Default is '.JPG'
     - incl (list of str): names or extract of folder names to include in
         the search.
     - excl (list of str): names or extract of folder names to exclude from
@@ -606,42 +749,156 @@ def explore_folder(folder, ff='.JPG', incl=None, excl=None):
     
     Returns
     -------
-    - ind_list (list of str): individuals portrayed in the pictures, sorted in
-        alphabetical order
-    - pic_list (list of path like): pictures in the folder and subfolders.
+    - pairs (list of (str, path like)): individual portrayed and path of each
+        picture in the folder and subfolders.
+    
+    Remark
+    ------
+    Missing or unreadable folders are skipped, as with os.walk.
     """
     
-    # Get all pictures and list of individuals in pictures.
-    pic_list = []
-    inds = []
-    for path, subfolders, files in os.walk(folder):
-        for file in files:
-            f = os.path.join(path, file)
-            dec = check_file(f, incl, excl)
-            if dec:
-                pic_list.append(f)
-                inds.append(file.split('_')[0])
+    if not os.path.isdir(folder):  # Missing folder, e.g. cancelled browsing.
+        return []
+    excl_re = compile_terms(excl)
+    if excl_re and excl_re.search(folder):  # Whole folder excluded.
+        return []
     
-    # Get ordered set of individuals.
-    ind_list = sorted(list(set(inds)))
+    ext = '.' + ff.lstrip('.')
+    suffixes = tuple({ext, ext.lower(), ext.upper()})
     
-    return ind_list, pic_list
+    return list(_scan_folder(folder, suffixes, compile_terms(incl), excl_re))
+
 
-def check_file(filepath, incl, excl):
+def _scan_folder(folder, suffixes, incl_re, excl_re):
     """
-    Check if file path contains elements from inclusion and exclusion list.
+    Yields the individual portrayed and the path of the files ending with one
+    of the suffixes in folder and its subfolders, if selected by check_file.
+    Subfolders which path contains an exclusion term are not explored.
+    Uses os.scandir, whose entries cache the file type read with the folder
+    content, instead of os.walk which checks it again. Subfolders are stacked
+    instead of explored by recursive generators. Folders which cannot be read
+    are skipped, as with os.walk.
+    """
+    stack = [folder]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:  # Missing or unreadable folder.
+            continue
+        with it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    if not (excl_re and excl_re.search(entry.path)):
+                        stack.append(entry.path)
+                elif (entry.name.endswith(suffixes)
+                      and check_file(entry.path, incl_re, excl_re)):
+                    yield entry.name.split('_', 1)[0], entry.path
+
+def check_file(filepath, incl_re, excl_re):
+    """
+    Check if file path contains elements from inclusion and exclusion list,
+    compiled with compile_terms.
     Return boolean decision for adding photo in quizz.
     """
-    if incl is not None:
-        if not any([elt in filepath for elt in incl]):  # No inclusion term.
-            return False
-    if excl is not None:
-        if any ([elt in filepath for elt in excl]):  # Exclusion term
-            return False
+    if incl_re and not incl_re.search(filepath):  # No inclusion term.
+        return False
+    if excl_re and excl_re.search(filepath):  # Exclusion term
+        return False
     
     return True
 
 
+def compile_terms(terms):
+    """
+    Compiles a list of inclusion or exclusion terms into a single regular
+    expression matching any of them. Returns None if there is no term.
+    """
+    if not terms:
+        return None
+    
+    return re.compile('|'.join(map(re.escape, terms)))
+
+
+def fit_image(path, size):
+    """
+    Opens a photo, pads it to a square with a grey background and resizes it
+    to size x size pixels.
+    """
+    from PIL import Image
+    
+    im = Image.open(path)
+    # Let the JPEG decoder downscale while reading large photos.
+    im.draft('RGB', (size*2, size*2))
+    # Resize photo to fit in the square, in a single resample.
+    scale = size / max(im.size)
+    new_size = (max(1, round(im.width * scale)), max(1, round(im.height * scale)))
+    im = im.resize(new_size, Image.BILINEAR, reducing_gap=2.0)
+    # Paste photo in the middle of a grey square.
+    im_fit = Image.new('RGB', (size, size), (100, 100, 100))
+    im_fit.paste(im, ((size - im.width) // 2, (size - im.height) // 2))
+    return im_fit
+
+
+def accumulate(pairs, arr, correct_col):
+    """
+    Adds one answer to arr for each (row, column) pair of indices, and one
+    correct answer when row and column are the same individual.
+    """
+    kernels = _numba_kernels() if pairs.size >= NUMBA_MIN_SIZE else None
+    if kernels is not None:
+        kernels[0](pairs, arr, correct_col)
+    else:
+        np.add.at(arr, (pairs[:, 0], pairs[:, 1]), 1)
+        right = pairs[pairs[:, 0] == pairs[:, 1], 0]
+        np.add.at(arr, (right, correct_col), 1)
+
+
+def row_normalize(vals, out):
+    """
+    Divides each row of vals by the sum of its values except the last one.
+    Rows summing to 0 are left unchanged. out can be vals.
+    """
+    kernels = _numba_kernels() if vals.size >= NUMBA_MIN_SIZE else None
+    if kernels is not None:
+        kernels[1](vals, out)
+    else:
+        denom = vals[:, :-1].sum(axis=1, keepdims=True)
+        np.divide(vals, np.where(denom == 0, 1, denom), out=out)
+
+
+@functools.lru_cache(maxsize=None)
+def _numba_kernels():
+    """
+    Imports numba and compiles the loops of accumulate and row_normalize on
+    first use. Returns None if numba is not installed.
+    """
+    try:
+        import numba
+    except ImportError:
+        return None
+    
+    @numba.njit
+    def accumulate_nb(pairs, arr, correct_col):
+        for k in range(pairs.shape[0]):
+            i = pairs[k, 0]
+            j = pairs[k, 1]
+            arr[i, j] += 1
+            if i == j:
+                arr[i, correct_col] += 1
+    
+    @numba.njit(parallel=True)
+    def row_normalize_nb(vals, out):
+        for i in numba.prange(vals.shape[0]):
+            s = 0.0
+            for k in range(vals.shape[1] - 1):
+                s += vals[i, k]
+            inv = 1.0 / s if s else 1.0
+            for k in range(vals.shape[1]):
+                out[i, k] = vals[i, k] * inv
+    
+    return accumulate_nb, row_normalize_nb
+
+
 def tkclear(frame):
     """
     Clears all elements within a tkinter frame.
@@ -652,8 +909,33 @@ def tkclear(frame):
 def load_results(fileName):
     """
     Reads previous identification results from manually input csv file.
+    Files ending in .parquet or .feather are read in these formats.
+    Files are parsed again only if they were modified since the last call.
+    """
+    mtime = os.stat(fileName).st_mtime_ns
+    return _read_results(fileName, mtime).copy()
+
+
+@functools.lru_cache(maxsize=8)
+def _read_results(fileName, mtime):
+    """
+    Cached reading of load_results. mtime is not used but renews the cache
+    when the file is modified.
     """
-    score = pd.read_csv(fileName, index_col=0)
+    ext = os.path.splitext(fileName)[1].lower()
+    if ext == '.parquet':
+        score = pd.read_parquet(fileName)
+    elif ext == '.feather':
+        score = pd.read_feather(fileName)
+        score = score.set_index(score.columns[0])
+        score.index.name = None
+    else:  # Ids read as text, so that e.g. '042' is not parsed as 42.
+        score = pd.read_csv(fileName, dtype={0: str})
+        score = score.set_index(score.columns[0])
+        score.index.name = None
+    # Ids are always text, like the column names and the photo names.
+    score.index = score.index.map(str)
+    score.columns = score.columns.map(str)
     return score
 
 
@@ -689,3 +971,33 @@ def photo_quizz(folders=None, incl=None, excl=None, n=None,
     
     # Save output in designated locations.
     my_quizz.save_results(figname=out_f, csvname=out_t)
+
+
+
+def main(n=10):
+    """
+    Runs a photo identification quizz set up from the configuration window.
+    Results are saved in the locations given in the configuration window once
+    the quizz window is closed.
+    
+    Argument
+    --------
+    n (int): number of questions to ask. Default is 10.
+    """
+    
+    my_quizz = Quizz(folders=[])
+    my_quizz.config()
+    my_quizz.choose_photos()
+    my_quizz.start_quizz(n=n)
+    my_quizz.window.mainloop()  # Returns when the window is closed.
+    my_quizz.save_results()
+
+
+if __name__ == '__main__':
+    # e.g. python photoID.py 5 for a 5 questions quizz.
+    import sys
+    
+    if len(sys.argv) > 1:
+        main(n=int(sys.argv[1]))
+    else:
+        main()